@@ -0,0 +1,75 @@
+"""
+DETAIL 레코드 한 건당 메모리 사용량을 딕셔너리(기존)와 TestItemRecord(__slots__)로 비교합니다.
+
+실행: python -m benchmark.detail_record_memory [레코드 수]
+"""
+
+import sys
+import tracemalloc
+
+from raw_message_processor.record import TESTITEM_COLUMNS, TestItemRecord
+
+MEASUREMENT_COLUMN_COUNT = TESTITEM_COLUMNS.index("INSP_DTL_SEQ")
+SAMPLE_LINE = "NR_n78_TX_636666CH_S876 R23 A54 P8_Ant54 SRS Tx Power 20dBm, 19.87, 18.5, 21.5, PASS, 0.012, 1, 0, 2"
+
+
+def build_dict_records(lines: list[str]) -> list[dict]:
+    """기존 방식: 레코드마다 12개 키를 가진 딕셔너리를 생성"""
+    records = []
+    for sequence, line in enumerate(lines, start=1):
+        record = dict.fromkeys(TESTITEM_COLUMNS)
+        values = map(
+            str.strip,
+            line.split(",", MEASUREMENT_COLUMN_COUNT)[:MEASUREMENT_COLUMN_COUNT],
+        )
+        for k, v in zip(TESTITEM_COLUMNS, values):
+            record[k] = v
+        record["INSP_DTL_SEQ"] = str(sequence)
+        record["IS_FINAL"] = "Y"
+        records.append(record)
+    return records
+
+
+def build_slotted_records(lines: list[str]) -> list[TestItemRecord]:
+    """변경 방식: 레코드마다 __slots__ 기반 TestItemRecord를 생성"""
+    records = []
+    for sequence, line in enumerate(lines, start=1):
+        record = TestItemRecord(
+            *map(
+                str.strip,
+                line.split(",", MEASUREMENT_COLUMN_COUNT)[:MEASUREMENT_COLUMN_COUNT],
+            ),
+            INSP_DTL_SEQ=str(sequence),
+        )
+        record.IS_FINAL = "Y"
+        records.append(record)
+    return records
+
+
+def measure(builder, lines: list[str]) -> int:
+    """레코드 생성 후 유지되고 있는 메모리(bytes)를 측정"""
+    tracemalloc.start()
+    records = builder(lines)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    lines = [SAMPLE_LINE] * count
+
+    for name, builder in (
+        ("dict", build_dict_records),
+        ("TestItemRecord", build_slotted_records),
+    ):
+        total = measure(builder, lines)
+        print(
+            f"{name:>15}: {total / count:8.1f} bytes/record "
+            f"({total / 1048576:.1f} MB for {count} records)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
 import asyncio
+import random
+from collections import deque
 
 import uvloop
-from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, TopicPartition
 from confluent_kafka.serialization import MessageField, SerializationContext
 
 from util.logger import logger, setup_logger
 
 from .config import settings
 from .exceptions import ParsingError, TestCodeExtractionError, UnsupportedTestCodeError
-from .parser import get_parser_for, get_test_code
+from .parser import BaseParser, get_parser_for, get_test_code
+from .prefilter import MessagePrefilter
+from .record import TestItemRecord
 from .schema import (
+    final_deserializer,
+    final_serializer,
     full_deserializer,
     full_serializer,
     master_deserializer,
@@ -55,9 +61,66 @@ async def serialize_and_send(
         )
 
 
+async def send_detail(
+    producer: AIOKafkaProducer,
+    master_data: dict,
+    detail_data: list[TestItemRecord],
+    final_data: list[TestItemRecord],
+    test_code: str,
+):
+    """
+    전체 데이터와 최종 측정값 데이터를 각각 직렬화 후 병렬로 전송합니다.
+    전체 데이터는 test_code별 전송 비율(full_sample_rates)에 따라 샘플링하거나 생략합니다.
+    """
+    tasks = []
+    sample_rate = settings.producer.full_sample_rates.get(test_code, 1.0)
+    if sample_rate >= 1.0 or random.random() < sample_rate:
+        tasks.append(
+            serialize_and_send(
+                producer,
+                full_serializer,
+                full_deserializer,  # 역직렬화기 전달
+                settings.producer.detail_topic,
+                {"MASTER": master_data, "DETAIL": detail_data},
+                test_code,
+            )
+        )
+    if settings.producer.final_topic:
+        tasks.append(
+            serialize_and_send(
+                producer,
+                final_serializer,
+                final_deserializer,  # 역직렬화기 전달
+                settings.producer.final_topic,
+                {"MASTER": master_data, "DETAIL": final_data},
+                test_code,
+            )
+        )
+    await asyncio.gather(*tasks)
+
+
+def log_processing_error(e: Exception, test_code: str, message: bytes):
+    """메시지 처리 중 발생한 예외를 종류에 맞게 원 메시지와 함께 로깅합니다."""
+    decoded_message = message.decode("utf-8", errors="ignore")
+    match e:
+        case TestCodeExtractionError() | UnsupportedTestCodeError():
+            logger.error(
+                f"{e}. Skipping message.", extra={"raw_message": decoded_message}
+            )
+        case ParsingError():
+            logger.error(
+                f"[{test_code}] Message Parsing error: {e}",
+                extra={"raw_message": decoded_message},
+            )
+        case _:
+            logger.exception(
+                f"[{test_code}] An unexpected error occurred during message processing: {e}.",
+                extra={"raw_message": decoded_message},
+            )
+
+
 async def process_message(message: bytes, producer: AIOKafkaProducer):
     """카프카의 원 메시지를 처리하여 새로운 토픽으로 전달합니다."""
-    decoded_message = message.decode("utf-8", errors="ignore")
     test_code = "UNKNOWN"  # 초기값 설정
 
     try:
@@ -66,17 +129,19 @@ async def process_message(message: bytes, producer: AIOKafkaProducer):
         parser = get_parser_for(test_code)
 
         # 2. 데이터를 딕셔너리 타입으로 파싱
-        parsed_message = parser.parse(message)
-        master_data = parsed_message.get("MASTER")
+        sections = parser.split(message)
+        master_data = parser.parse_master(sections)
 
         if not master_data:
             logger.warning(
                 f"[{test_code}] 'MASTER' data not found in parsed message. Skipping.",
-                extra={"raw_message": decoded_message},
+                extra={"raw_message": message.decode("utf-8", errors="ignore")},
             )
             return
 
-        # 3. 마스터 데이터와 전체 데이터를 각각 직렬화 후 병렬로 전송
+        detail_data, final_data = parser.parse_detail(sections)
+
+        # 3. 마스터 데이터와 전체/최종 데이터를 각각 직렬화 후 병렬로 전송
         master_task = serialize_and_send(
             producer,
             master_serializer,
@@ -85,30 +150,147 @@ async def process_message(message: bytes, producer: AIOKafkaProducer):
             master_data,
             test_code,
         )
-        full_task = serialize_and_send(
+        detail_task = send_detail(
+            producer, master_data, detail_data, final_data, test_code
+        )
+        await asyncio.gather(master_task, detail_task)
+
+    except Exception as e:
+        log_processing_error(e, test_code, message)
+
+
+async def process_master(
+    message: bytes, producer: AIOKafkaProducer
+) -> tuple[str, BaseParser, dict[str, bytes], dict] | None:
+    """
+    헤더와 테일만 파싱하여 마스터 데이터를 먼저 전송합니다.
+    DETAIL 처리에 필요한 (test_code, parser, sections, master_data)를 반환하며, 실패 시 None을 반환합니다.
+    """
+    test_code = "UNKNOWN"  # 초기값 설정
+
+    try:
+        # 1. 테스트 코드(공정)에 맞는 파서를 선택
+        test_code = get_test_code(message)
+        parser = get_parser_for(test_code)
+
+        # 2. 로그를 구분한 뒤 헤더와 테일만 파싱 (바디 크기와 무관하여 이벤트 루프에서 바로 처리)
+        sections = parser.split(message)
+        master_data = parser.parse_master(sections)
+
+        if not master_data:
+            logger.warning(
+                f"[{test_code}] 'MASTER' data not found in parsed message. Skipping.",
+                extra={"raw_message": message.decode("utf-8", errors="ignore")},
+            )
+            return None
+
+        # 3. 마스터 데이터를 직렬화 후 전송
+        await serialize_and_send(
             producer,
-            full_serializer,
-            full_deserializer,  # 역직렬화기 전달
-            settings.producer.detail_topic,
-            parsed_message,
+            master_serializer,
+            master_deserializer,
+            settings.producer.master_topic,
+            master_data,
             test_code,
         )
-        await asyncio.gather(master_task, full_task)
+        return test_code, parser, sections, master_data
+
+    except Exception as e:
+        log_processing_error(e, test_code, message)
+        return None
+
+
+async def process_detail(
+    message: bytes,
+    pending: tuple[str, BaseParser, dict[str, bytes], dict],
+    producer: AIOKafkaProducer,
+    semaphore: asyncio.Semaphore,
+):
+    """마스터 전송 이후 바디를 파싱하여 전체/최종 데이터를 전송합니다. 동시 처리 개수는 semaphore로 제한합니다."""
+    test_code, parser, sections, master_data = pending
+
+    try:
+        async with semaphore:
+            detail_data, final_data = await asyncio.to_thread(
+                parser.parse_detail, sections
+            )
+            await send_detail(producer, master_data, detail_data, final_data, test_code)
 
-    except TestCodeExtractionError as e:
-        logger.error(f"{e}. Skipping message.", extra={"raw_message": decoded_message})
-    except UnsupportedTestCodeError as e:
-        logger.error(f"{e}. Skipping message.", extra={"raw_message": decoded_message})
-    except ParsingError as e:
-        logger.error(
-            f"[{test_code}] Message Parsing error: {e}",
-            extra={"raw_message": decoded_message},
-        )
     except Exception as e:
-        logger.exception(
-            f"[{test_code}] An unexpected error occurred during message processing: {e}.",
-            extra={"raw_message": decoded_message},
+        log_processing_error(e, test_code, message)
+
+
+async def process_master_first(
+    messages: list[bytes],
+    producer: AIOKafkaProducer,
+    semaphore: asyncio.Semaphore,
+) -> asyncio.Future:
+    """
+    배치 내 모든 마스터 데이터를 먼저 전송하고, 전체 데이터 처리는 기다리지 않고 시작만 합니다.
+    반환된 Future가 완료되면 해당 배치의 전체 데이터 처리가 끝난 것입니다.
+    """
+    pendings = await asyncio.gather(
+        *(process_master(message, producer) for message in messages)
+    )
+    return asyncio.gather(
+        *(
+            process_detail(message, pending, producer, semaphore)
+            for message, pending in zip(messages, pendings)
+            if pending is not None
         )
+    )
+
+
+async def commit_finished_batches(
+    consumer: AIOKafkaConsumer,
+    inflight_batches: deque[tuple[asyncio.Future, dict[TopicPartition, int]]],
+):
+    """
+    전체 데이터 처리가 끝난 배치를 오래된 순서대로 꺼내 오프셋을 커밋합니다.
+    앞선 배치가 끝나지 않았다면 이후 배치가 끝났더라도 커밋하지 않습니다.
+    """
+    offsets = {}
+    while inflight_batches and inflight_batches[0][0].done():
+        _, batch_offsets = inflight_batches.popleft()
+        offsets.update(batch_offsets)
+
+    # __debug__가 False일 때 (프로덕션 모드)만 오프셋을 커밋합니다.
+    if not offsets or __debug__:
+        return
+    await consumer.commit(offsets)
+    logger.info(f"Offset committed successfully for the processed batches: {offsets}")
+
+
+async def prefilter_messages(
+    messages: list[bytes],
+    producer: AIOKafkaProducer,
+    prefilter: MessagePrefilter,
+) -> list[bytes]:
+    """
+    디코딩 및 파싱 이전에 prefilter 규칙으로 메시지를 분류합니다.
+    drop은 버리고, passthrough는 원 메시지 그대로 전송하며, 파싱할 메시지만 반환합니다.
+    """
+    to_parse = []
+    passthrough_tasks = []
+    for message in messages:
+        match prefilter.classify(message):
+            case "parse":
+                to_parse.append(message)
+            case "passthrough" if settings.producer.passthrough_topic:
+                passthrough_tasks.append(
+                    producer.send(settings.producer.passthrough_topic, message)
+                )
+            case _:  # drop
+                pass
+
+    if passthrough_tasks:
+        results = await asyncio.gather(*passthrough_tasks, return_exceptions=True)
+        for e in results:
+            if isinstance(e, Exception):
+                logger.error(
+                    f"Failed to send message to topic {settings.producer.passthrough_topic}: {e}"
+                )
+    return to_parse
 
 
 async def main():
@@ -129,6 +311,21 @@ async def main():
     logger.info(f"  - Kafka Consumer: {settings.consumer.model_dump()}")
     logger.info(f"  - Kafka Producer: {settings.producer.model_dump()}")
     logger.info(f"  - Schema Registry: {settings.schema_registry.model_dump()}")
+    logger.info(f"  - Processor: {settings.processor.model_dump()}")
+    logger.info(f"  - Prefilter: {settings.prefilter.model_dump()}")
+
+    # prefilter 규칙 로드 (passthrough 규칙은 passthrough_topic이 필요)
+    prefilter = None
+    if settings.prefilter.enabled:
+        prefilter = MessagePrefilter(
+            settings.prefilter.rules_path, settings.prefilter.scan_bytes
+        )
+        if not prefilter.load():
+            exit(1)
+        if settings.producer.passthrough_topic is None:
+            logger.warning(
+                "Prefilter is enabled but 'passthrough_topic' is not set. Passthrough messages will be dropped."
+            )
 
     # Kafka 클라이언트 초기화
     consumer = AIOKafkaConsumer(
@@ -148,19 +345,57 @@ async def main():
     await producer.start()
     logger.info("Kafka consumer and producer started successfully.")
 
+    # DETAIL 파싱/FULL 직렬화의 동시 처리 개수 제한
+    detail_semaphore = asyncio.Semaphore(settings.processor.detail_concurrency)
+    # master_first 모드에서 전체 데이터 처리가 진행 중인 배치와 커밋할 오프셋
+    inflight_batches: deque[tuple[asyncio.Future, dict[TopicPartition, int]]] = deque()
+
     try:
         while True:
+            if settings.processor.master_first:
+                await commit_finished_batches(consumer, inflight_batches)
+                # 진행 중인 배치가 상한에 도달하면 가장 오래된 배치가 끝날 때까지 대기
+                if len(inflight_batches) >= settings.processor.max_inflight_batches:
+                    await asyncio.wait([inflight_batches[0][0]])
+                    continue
+
             result = await consumer.getmany(timeout_ms=1000, max_records=200)
             if not result:
                 continue
 
+            # 규칙 파일이 변경된 경우 재시작 없이 반영
+            if prefilter is not None:
+                prefilter.reload_if_changed()
+
+            # master_first 모드에서는 마스터 데이터를 먼저 전송하고, 전체 데이터는 이후 배치를
+            # 가져오는 동안 처리합니다. 오프셋은 해당 배치의 전체 데이터 처리가 끝난 후에 커밋합니다.
+            if settings.processor.master_first:
+                values = []
+                offsets = {}
+                for tp, messages in result.items():
+                    logger.info(
+                        f"Fetched {len(messages)} messages from partition {tp}."
+                    )
+                    values.extend(
+                        msg.value for msg in messages if msg.value is not None
+                    )
+                    offsets[tp] = messages[-1].offset + 1
+                if prefilter is not None:
+                    values = await prefilter_messages(values, producer, prefilter)
+                    logger.debug(f"Prefilter hits: {prefilter.hits}")
+                detail_future = await process_master_first(
+                    values, producer, detail_semaphore
+                )
+                inflight_batches.append((detail_future, offsets))
+                continue
+
             for tp, messages in result.items():
                 logger.info(f"Fetched {len(messages)} messages from partition {tp}.")
-                tasks = [
-                    process_message(msg.value, producer)
-                    for msg in messages
-                    if msg.value is not None
-                ]
+                values = [msg.value for msg in messages if msg.value is not None]
+                if prefilter is not None:
+                    values = await prefilter_messages(values, producer, prefilter)
+                    logger.debug(f"Prefilter hits: {prefilter.hits}")
+                tasks = [process_message(value, producer) for value in values]
                 if tasks:
                     await asyncio.gather(*tasks)
 
@@ -172,6 +407,11 @@ async def main():
 
     finally:
         logger.info("Application shutting down.")
+        # 처리 중인 전체 데이터는 취소하며, 커밋되지 않은 오프셋은 재시작 시 다시 처리됩니다.
+        for detail_future, _ in inflight_batches:
+            detail_future.cancel()
+        if prefilter is not None:
+            logger.info(f"Prefilter hits: {prefilter.hits}")
         await producer.stop()
         await consumer.stop()
         logger.info("All resources have been cleaned up. Application terminated.")
@@ -2,7 +2,7 @@ from pathlib import Path
 from typing import Any
 
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -40,12 +40,30 @@ class KafkaProducerSettings(BaseModel):
     master_topic: str
     detail_topic: str
     bootstrap_servers: str
+    # prefilter에서 passthrough로 분류된 원 메시지 토픽
+    passthrough_topic: str | None = None
+    final_topic: str | None = None  # 테스트 조건별 최종 측정값만 담은 토픽
+    # test_code별 전체 토픽 전송 비율(기본 1.0, 0이면 미전송)
+    full_sample_rates: dict[str, float] = {}
     compression_type: str | None = None
     max_request_size_mb: int = 1
 
 
 class SchemaRegistrySettings(BaseModel):
     url: str
+    final_schema_id: int | None = None  # final_topic 사용 시 필수
+
+
+class PrefilterSettings(BaseModel):
+    enabled: bool = False
+    rules_path: str = str(CONFIG_PATH.parent / "prefilter.yaml")
+    scan_bytes: int = 4096  # 규칙 매칭을 위해 읽어들이는 메시지 앞부분 크기
+
+
+class ProcessorSettings(BaseModel):
+    master_first: bool = False  # MASTER를 먼저 전송하고 DETAIL은 후순위로 처리
+    detail_concurrency: int = 4  # DETAIL 파싱/FULL 직렬화의 동시 처리 개수
+    max_inflight_batches: int = 2  # DETAIL 처리가 끝나지 않은 배치의 최대 개수
 
 
 class AppSettings(BaseSettings):
@@ -55,6 +73,8 @@ class AppSettings(BaseSettings):
     consumer: KafkaConsumerSettings
     producer: KafkaProducerSettings
     schema_registry: SchemaRegistrySettings
+    processor: ProcessorSettings = ProcessorSettings()
+    prefilter: PrefilterSettings = PrefilterSettings()
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -88,6 +108,15 @@ class AppSettings(BaseSettings):
             file_secret_settings,
         )
 
+    @model_validator(mode="after")
+    def check_final_schema_id(self) -> "AppSettings":
+        """final_topic을 사용하는 경우 final_schema_id가 설정되었는지 확인합니다."""
+        if self.producer.final_topic and self.schema_registry.final_schema_id is None:
+            raise ValueError(
+                "'schema_registry.final_schema_id' is required when 'producer.final_topic' is set"
+            )
+        return self
+
 
 # 설정 인스턴스 생성
 settings = AppSettings()  # type: ignore
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from ..record import TestItemRecord
+
 
 class BaseParser(ABC):
     """모든 파서의 기반이 되는 추상 클래스"""
@@ -11,3 +13,20 @@ class BaseParser(ABC):
     def parse(self, message: bytes) -> dict:
         """입력받은 바이트 메시지를 파싱하여 딕셔너리(Json) 형태로 반환"""
         raise NotImplementedError
+
+    @abstractmethod
+    def split(self, message: bytes) -> dict[str, bytes]:
+        """입력받은 바이트 메시지를 MASTER/DETAIL 파싱에 필요한 부분들로 구분하여 반환"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def parse_master(self, sections: dict[str, bytes]) -> dict:
+        """구분된 메시지에서 요약 정보(MASTER)만 파싱하여 반환"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def parse_detail(
+        self, sections: dict[str, bytes]
+    ) -> tuple[list[TestItemRecord], list[TestItemRecord]]:
+        """구분된 메시지에서 측정값 레코드(DETAIL)와 테스트 조건별 최종 레코드를 파싱하여 반환"""
+        raise NotImplementedError
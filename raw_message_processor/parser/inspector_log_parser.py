@@ -1,21 +1,31 @@
+import re
+
 from util.logger import logger
 
 from ..exceptions import DelimiterNotFoundError
+from ..record import TESTITEM_COLUMNS, TestItemRecord
 from ..schema import master_default_dict
 from .base import BaseParser
 
-DEFAULT_TESTITEM_DICT = {
-    "Test_Conditions": None,
-    "Measured_Value": None,
-    "Lower_Limit": None,
-    "Upper_Limit": None,
-    "P_F": None,
-    "Sec": None,
-    "Code_Value": None,
-    "Code_Lower_Limit": None,
-    "Code_Upper_Limit": None,
-    "RF_INFO": None,
-}
+# 로그에서 읽어오는 측정 컬럼 수 (INSP_DTL_SEQ 이후 컬럼은 파서에서 채움)
+MEASUREMENT_COLUMN_COUNT = TESTITEM_COLUMNS.index("INSP_DTL_SEQ")
+
+# 로그를 헤더, 바디, 테일로 구분하는 구분자
+SECTION_DELIMITERS = {"header": b"#INIT", "body": b"#TEST", "tail": b"#END"}
+
+# 주석 등 불필요 문장의 시작 및 종료 문자 (제거 순서대로)
+COMMENT_BETWEEN = (
+    ("/*", "*/"),  # 범위 주석
+    ("//", "\r\n"),  # 한줄 주석
+    ("<<", ">>"),  # << 타이틀 >>
+    ("===", "\r\n"),  # === 타이틀
+)
+_COMMENT_CLOSERS = {start.encode(): end.encode() for start, end in COMMENT_BETWEEN}
+_SECTION_TOKEN_PATTERN = re.compile(
+    b"|".join(
+        re.escape(token) for token in (*_COMMENT_CLOSERS, *SECTION_DELIMITERS.values())
+    )
+)
 
 
 class DefaultInspectorLogParser(BaseParser):
@@ -23,15 +33,10 @@ class DefaultInspectorLogParser(BaseParser):
         super().__init__(test_code)
 
     def parse(self, message: bytes) -> dict:
-        raw_text = message.decode("utf-8")
-        parsed_message = self.process(raw_text)
-        return parsed_message
-
-    def process(self, raw_text: str) -> dict:
-        """휴대폰 검사기의 원 로그(text)를 딕셔너리로 변경합니다.
+        """휴대폰 검사기의 원 로그를 딕셔너리로 변경합니다.
 
         Args:
-            raw_text (str): 휴대폰 검사기 로그(원 데이터)를 의미함
+            message (bytes): 휴대폰 검사기 로그(원 데이터)를 의미함
 
         Raises:
             DelimiterNotFoundError: HEADER, BODY, TAIL의 구별자를 찾지 못하는 경우 발생
@@ -41,52 +46,87 @@ class DefaultInspectorLogParser(BaseParser):
                 BOOTING, HEADER, BODY, TAIL의 4개 부분을
                 MASTER(HEADER + TAIL), DETAIL(BOOTING + BODY)로 재구성
         """
+        sections = self.split(message)
+        parsed_message = {
+            "MASTER": self.parse_master(sections),
+            "DETAIL": self.parse_detail(sections)[0],
+        }
+        return parsed_message
+
+    def split(self, message: bytes) -> dict[str, bytes]:
+        """원 로그(bytes)를 디코딩 없이 부팅, 헤더, 바디, 테일 부분으로 구분합니다.
+
+        Raises:
+            DelimiterNotFoundError: HEADER, BODY, TAIL의 구별자를 찾지 못하는 경우 발생
+        """
         # 기본 키만 활용하고 추후 additional key를 반영할 지 검토(25.07.28)
-        # 1. 검사 로그에서 컬럼 정보 추출
         # additional_columns = self._extract_additional_keys(raw_text)
 
-        # 2. 주석 내용을 삭제
-        cleaned_text = self._remove_comment(raw_text)
-
-        # 3. 로그의 내용을 헤더, 바디, 테일로 구분
-        delimiters = {"header": "#INIT", "body": "#TEST", "tail": "#END"}
-        delimiter_start_pos = {k: cleaned_text.find(v) for k, v in delimiters.items()}
+        # 디코딩 및 주석 삭제는 각 부분을 파싱할 때 수행하여 MASTER가 바디 크기에 영향받지 않도록 함
+        # 단, 주석 안의 구분자는 무시해야 하므로 주석 구간을 건너뛰며 구분자를 찾음
+        delimiter_start_pos = self._find_delimiters(message)
         if any(v == -1 for v in delimiter_start_pos.values()):
             raise DelimiterNotFoundError(delimiter_start_pos.keys())
 
-        # 4. 측정값 추출
-        # 4-1. 헤더 앞에 부팅 로그 추출(Optional), 바디에 포함하되 검사 순서값은 0으로 고정
-        booting_log = cleaned_text[: delimiter_start_pos["header"]]
-        booting_record = self._log_to_record(booting_log, False)
-        # 4-2. 바디 추출, 검사 순서값이 1씩 증가
-        body_log = cleaned_text[
-            delimiter_start_pos["body"] : delimiter_start_pos["tail"]
-        ]
-        body_record = self._log_to_record(body_log, True)
-
-        # 5. 헤드와 테일 부분의 검사 요약정보
-        header_log = cleaned_text[
-            delimiter_start_pos["header"] : delimiter_start_pos["body"]
-        ]
-        tail_log = cleaned_text[delimiter_start_pos["tail"] :]
-        summary_dict = self._log_to_dict(header_log + tail_log)
-
-        # 6. 결과 조합 및 반환
-        parsed_message = {
-            "MASTER": summary_dict,
-            "DETAIL": booting_record + body_record,
+        return {
+            "booting": message[: delimiter_start_pos["header"]],
+            "header": message[
+                delimiter_start_pos["header"] : delimiter_start_pos["body"]
+            ],
+            "body": message[delimiter_start_pos["body"] : delimiter_start_pos["tail"]],
+            "tail": message[delimiter_start_pos["tail"] :],
         }
-        return parsed_message
+
+    def _find_delimiters(self, message: bytes) -> dict[str, int]:
+        """주석 구간을 건너뛰며 각 구분자가 처음 등장하는 위치를 찾습니다. (없으면 -1)"""
+        delimiter_names = {v: k for k, v in SECTION_DELIMITERS.items()}
+        delimiter_start_pos = dict.fromkeys(SECTION_DELIMITERS, -1)
+        pos = 0
+        while match := _SECTION_TOKEN_PATTERN.search(message, pos):
+            token = match.group()
+            if token in _COMMENT_CLOSERS:
+                # 주석 종료 문자 뒤로 이동 (종료 문자가 없으면 시작 문자만 건너뜀)
+                end_pos = message.find(_COMMENT_CLOSERS[token], match.end())
+                pos = (
+                    match.end()
+                    if end_pos == -1
+                    else end_pos + len(_COMMENT_CLOSERS[token])
+                )
+                continue
+            name = delimiter_names[token]
+            if delimiter_start_pos[name] == -1:
+                delimiter_start_pos[name] = match.start()
+                if all(v != -1 for v in delimiter_start_pos.values()):
+                    break
+            pos = match.end()
+        return delimiter_start_pos
+
+    def parse_master(self, sections: dict[str, bytes]) -> dict:
+        """헤드와 테일 부분만 디코딩하여 검사 요약정보(MASTER)를 생성합니다."""
+        header_log = self._remove_comment(sections["header"].decode("utf-8"))
+        tail_log = self._remove_comment(sections["tail"].decode("utf-8"))
+        return self._log_to_dict(header_log + "\r\n" + tail_log)
+
+    def parse_detail(
+        self, sections: dict[str, bytes]
+    ) -> tuple[list[TestItemRecord], list[TestItemRecord]]:
+        """부팅 로그와 바디 부분으로 측정값 레코드(DETAIL)와 최종 측정값 레코드를 생성합니다."""
+        # 헤더 앞에 부팅 로그 추출(Optional), 바디에 포함하되 검사 순서값은 0으로 고정
+        booting_log = self._remove_comment(sections["booting"].decode("utf-8"))
+        booting_record, booting_final = self._log_to_record(booting_log, False)
+        # 바디 추출, 검사 순서값이 1씩 증가
+        body_log = self._remove_comment(sections["body"].decode("utf-8"))
+        body_record, body_final = self._log_to_record(body_log, True)
+        return booting_record + body_record, booting_final + body_final
 
     def _log_to_record(
         self,
         raw_text: str,
         incremental_sequence: bool = True,
-    ) -> list[dict[str, str]]:
-        """csv형태의 로그 내용을 dictionary record 형태로 변환함"""
+    ) -> tuple[list[TestItemRecord], list[TestItemRecord]]:
+        """csv형태의 로그 내용을 TestItemRecord 형태로 변환하고, 최종 검사 레코드를 함께 반환함"""
 
-        # 딕셔너리 리스트로 변환
-        test_item = DEFAULT_TESTITEM_DICT.copy()
+        # 레코드 리스트로 변환 (측정 컬럼만 사용)
         records = []
         sequence = 0
         for line in raw_text.split("\r\n"):
@@ -94,22 +134,31 @@ class DefaultInspectorLogParser(BaseParser):
                 continue
             if line[0] == "#":
                 continue
-            for k, v in zip(DEFAULT_TESTITEM_DICT, map(str.strip, line.split(","))):
-                test_item[k] = v
-            test_item["INSP_DTL_SEQ"] = (
-                str(sequence := sequence + 1) if incremental_sequence else str(0)
+            values = map(
+                str.strip,
+                line.split(",", MEASUREMENT_COLUMN_COUNT)[:MEASUREMENT_COLUMN_COUNT],
+            )
+            records.append(
+                TestItemRecord(
+                    *values,
+                    INSP_DTL_SEQ=(
+                        str(sequence := sequence + 1) if incremental_sequence else "0"
+                    ),
+                )
             )
-            test_item["RF_INFO"] = None
-            records.append(test_item)
 
         # 최종 검사여부 확인
         tested_items = set()
+        final_records = []
         for record in records[::-1]:  # 역순으로 처음 등장 항목을 Y로 지정
-            record["IS_FINAL"] = (
-                "Y" if record["Test_Conditions"] not in tested_items else "N"
-            )
-            tested_items.add(record["Test_Conditions"])
-        return records
+            if record.Test_Conditions not in tested_items:
+                record.IS_FINAL = "Y"
+                final_records.append(record)
+            else:
+                record.IS_FINAL = "N"
+            tested_items.add(record.Test_Conditions)
+        final_records.reverse()  # 검사 순서대로 정렬
+        return records, final_records
 
     def _log_to_dict(
         self,
@@ -166,10 +215,8 @@ class DefaultInspectorLogParser(BaseParser):
 
     def _remove_comment(self, raw_text: str) -> str:
         """C++ 스타일의 주석 등 불필요 문장을 제거합니다."""
-        raw_text = self._remove_between(raw_text, between=("/*", "*/"))  # 범위 주석
-        raw_text = self._remove_between(raw_text, between=("//", "\r\n"))  # 한줄 주석
-        raw_text = self._remove_between(raw_text, between=("<<", ">>"))  # << 타이틀 >>
-        raw_text = self._remove_between(raw_text, between=("===", "\r\n"))  # === 타이틀
+        for between in COMMENT_BETWEEN:
+            raw_text = self._remove_between(raw_text, between=between)
         return raw_text
 
     def _remove_between(self, raw_text: str, between: tuple[str, str]):
@@ -200,8 +247,8 @@ class DefaultInspectorLogParser(BaseParser):
     #     # 추출된 키가 기본 키보다 더 많은 경우 추가되는 부분만 리스트로 구성하여 반환
     #     extracted_keys = raw_text[start_pos:end_pos].split(",")
     #     additional_keys = (
-    #         [k.strip() for k in extracted_keys[len(DEFAULT_TESTITEM_DICT) :]]
-    #         if len(extracted_keys) > len(DEFAULT_TESTITEM_DICT)
+    #         [k.strip() for k in extracted_keys[MEASUREMENT_COLUMN_COUNT :]]
+    #         if len(extracted_keys) > MEASUREMENT_COLUMN_COUNT
     #         else []
     #     )
     #     return additional_keys
@@ -234,7 +281,9 @@ class RFInspectorLogParser(DefaultInspectorLogParser):
     def __init__(self, test_code: str) -> None:
         super().__init__(test_code)
 
-    def process(self, raw_text: str) -> dict:
+    def parse_detail(
+        self, sections: dict[str, bytes]
+    ) -> tuple[list[TestItemRecord], list[TestItemRecord]]:
         """
         검사 항목(이름)을 참고하여 6가지 정보를 추출 후 파싱 결과(바디)에 추가 반영합니다.
         예) NR_n78_TX_636666CH_S876 R23 A54 P8_Ant54 SRS Tx Power 20dBm
@@ -242,31 +291,26 @@ class RFInspectorLogParser(DefaultInspectorLogParser):
             NR(Tech), n78(Band), TX(RX or TX), 636666CH(Channel),
             S876 R23 A54 P8(Signal Path), Ant54 SRS Tx Power 20dBm(Item)
         Args:
-            raw_text (str): 원 검사기 로그
+            sections (dict[str, bytes]): 부팅, 헤더, 바디, 테일로 구분된 원 검사기 로그
 
         Returns:
-            dict[str, str | list[dict]]: 바디의 테스트 레코드에 6가지 정보를 추가한 딕셔너리
+            tuple[list[TestItemRecord], list[TestItemRecord]]: 6가지 정보를 추가한 전체 레코드와 최종 레코드 리스트
+                (최종 레코드는 전체 레코드와 동일한 객체를 참조하므로 함께 반영됨)
         """
         # 1. 기본 파서로 먼저 데이터 정제함
-        parsed_massage = super().process(raw_text)
+        detail_records, final_records = super().parse_detail(sections)
 
         # 2. test_condition의 내용을 더욱 세부적으로 구분하여 rf_info 컬럼에 추가함
         sequence = ["tech", "band", "direction", "channel", "sigpath", "item"]
-        for test_record in parsed_massage["DETAIL"]:
-            splited_info = test_record["Test_Conditions"].split(
+        for test_record in detail_records:
+            splited_info = test_record.Test_Conditions.split(
                 "_", maxsplit=len(sequence) - 1
             )
             if len(splited_info) <= 3:
                 continue  # 아랫열에서 out of range 에러 방지
             if splited_info[2].upper() == "RX" or splited_info[2].upper() == "TX":
-                test_record.update(
-                    {
-                        "RF_INFO": {
-                            key: value
-                            for key, value in zip(
-                                sequence, map(str.strip, splited_info)
-                            )
-                        }
-                    }
-                )
-        return parsed_massage
+                test_record.RF_INFO = {
+                    key: value
+                    for key, value in zip(sequence, map(str.strip, splited_info))
+                }
+        return detail_records, final_records
@@ -0,0 +1,120 @@
+import re
+from pathlib import Path
+from typing import Literal
+
+import yaml
+from pydantic import BaseModel, field_validator
+
+from util.logger import logger
+
+Action = Literal["drop", "passthrough", "parse"]
+
+# 어떤 규칙에도 매칭되지 않은 메시지의 카운터 키 (규칙 이름으로 사용 불가)
+DEFAULT_RULE_NAME = "default"
+
+
+class PrefilterRule(BaseModel):
+    name: str
+    action: Action
+    match: dict[str, str]  # 헤더 필드명: 정규식 (모든 조건을 만족해야 매칭)
+
+
+class PrefilterRules(BaseModel):
+    default_action: Action = "parse"
+    rules: list[PrefilterRule] = []
+
+    @field_validator("rules")
+    @classmethod
+    def check_rule_names(cls, rules: list[PrefilterRule]) -> list[PrefilterRule]:
+        """규칙별 카운터가 섞이지 않도록 중복되거나 예약된 규칙 이름을 거부합니다."""
+        names = [rule.name for rule in rules]
+        if DEFAULT_RULE_NAME in names:
+            raise ValueError(f"Rule name '{DEFAULT_RULE_NAME}' is reserved")
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate rule names: {sorted(duplicates)}")
+        return rules
+
+
+class MessagePrefilter:
+    """
+    디코딩 및 파싱 이전에 원 메시지(bytes)의 앞부분만 읽어 처리 방식을 결정합니다.
+    - drop: 메시지를 버림
+    - passthrough: 원 메시지를 그대로 passthrough 토픽으로 전달
+    - parse: 기존과 동일하게 파싱 후 전달
+    규칙 파일이 변경되면 재시작 없이 다시 읽어들입니다.
+    """
+
+    def __init__(self, rules_path: str | Path, scan_bytes: int = 4096):
+        self.rules_path = Path(rules_path)
+        self.scan_bytes = scan_bytes
+        self.default_action: Action = "parse"
+        self.hits: dict[str, int] = {}
+        self._rules: list[tuple[str, Action, list[tuple[re.Pattern, re.Pattern]]]] = []
+        self._mtime: float | None = None
+
+    def load(self) -> bool:
+        """규칙 파일을 읽어 정규식을 컴파일합니다. 실패 시 기존 규칙을 유지하고 False를 반환합니다."""
+        mtime = None
+        try:
+            mtime = self.rules_path.stat().st_mtime
+            with open(self.rules_path, "r", encoding="utf-8") as f:
+                config = PrefilterRules.model_validate(yaml.safe_load(f) or {})
+            compiled_rules = [
+                (
+                    rule.name,
+                    rule.action,
+                    [
+                        (
+                            re.compile(
+                                rb"\r\n"
+                                + re.escape(field.encode())
+                                + rb"\s*:\s*(.*?)\s*\r\n",
+                                re.IGNORECASE,
+                            ),
+                            re.compile(pattern.encode()),
+                        )
+                        for field, pattern in rule.match.items()
+                    ],
+                )
+                for rule in config.rules
+            ]
+        except Exception as e:
+            logger.error(f"Failed to load prefilter rules from {self.rules_path}: {e}")
+            # 파일이 다시 수정될 때까지 재시도하지 않도록 실패한 파일의 수정 시각을 기록
+            self._mtime = mtime
+            return False
+
+        self._rules = compiled_rules
+        self._mtime = mtime
+        self.default_action = config.default_action
+        # 동일한 이름의 규칙은 기존 카운터를 유지
+        self.hits = {name: self.hits.get(name, 0) for name, _, _ in compiled_rules}
+        self.hits.setdefault(DEFAULT_RULE_NAME, 0)
+        logger.info(
+            f"Prefilter rules loaded: {len(compiled_rules)} rules, default action '{self.default_action}'."
+        )
+        return True
+
+    def reload_if_changed(self):
+        """규칙 파일의 수정 시각이 바뀐 경우에만 다시 읽어들입니다."""
+        try:
+            mtime = self.rules_path.stat().st_mtime
+        except OSError:
+            return  # 파일 교체 중이거나 접근할 수 없는 경우 기존 규칙을 유지
+        if mtime != self._mtime:
+            self.load()
+
+    def classify(self, message: bytes) -> Action:
+        """메시지 앞부분(scan_bytes)의 헤더 필드를 규칙과 비교하여 처리 방식을 반환합니다."""
+        head = message[: self.scan_bytes]
+        for name, action, conditions in self._rules:
+            for field_pattern, value_pattern in conditions:
+                found = field_pattern.search(head)
+                if not found or not value_pattern.search(found.group(1)):
+                    break
+            else:
+                self.hits[name] += 1
+                return action
+        self.hits[DEFAULT_RULE_NAME] += 1
+        return self.default_action
@@ -0,0 +1,78 @@
+from collections.abc import Iterator, Mapping
+
+# DETAIL 레코드의 컬럼 순서 (schema의 MEASUREMENT_DATA 필드 순서와 동일)
+TESTITEM_COLUMNS = (
+    "Test_Conditions",
+    "Measured_Value",
+    "Lower_Limit",
+    "Upper_Limit",
+    "P_F",
+    "Sec",
+    "Code_Value",
+    "Code_Lower_Limit",
+    "Code_Upper_Limit",
+    "INSP_DTL_SEQ",
+    "IS_FINAL",
+    "RF_INFO",
+)
+
+
+class TestItemRecord(Mapping):
+    """
+    DETAIL 레코드 한 건을 __slots__로 저장하는 경량 컨테이너입니다.
+    레코드마다 딕셔너리를 만들지 않아 메모리 사용량을 줄이며,
+    Mapping 인터페이스를 제공하므로 Avro 직렬화 등에서 딕셔너리처럼 사용할 수 있습니다.
+    """
+
+    __slots__ = TESTITEM_COLUMNS
+
+    def __init__(
+        self,
+        Test_Conditions: str | None = None,
+        Measured_Value: str | None = None,
+        Lower_Limit: str | None = None,
+        Upper_Limit: str | None = None,
+        P_F: str | None = None,
+        Sec: str | None = None,
+        Code_Value: str | None = None,
+        Code_Lower_Limit: str | None = None,
+        Code_Upper_Limit: str | None = None,
+        INSP_DTL_SEQ: str | None = None,
+        IS_FINAL: str | None = None,
+        RF_INFO: dict[str, str] | None = None,
+    ):
+        self.Test_Conditions = Test_Conditions
+        self.Measured_Value = Measured_Value
+        self.Lower_Limit = Lower_Limit
+        self.Upper_Limit = Upper_Limit
+        self.P_F = P_F
+        self.Sec = Sec
+        self.Code_Value = Code_Value
+        self.Code_Lower_Limit = Code_Lower_Limit
+        self.Code_Upper_Limit = Code_Upper_Limit
+        self.INSP_DTL_SEQ = INSP_DTL_SEQ
+        self.IS_FINAL = IS_FINAL
+        self.RF_INFO = RF_INFO
+
+    def __getitem__(self, key: str):
+        if key not in TESTITEM_COLUMNS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in TESTITEM_COLUMNS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TESTITEM_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(TESTITEM_COLUMNS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+    def to_dict(self) -> dict:
+        """기존 코드와의 호환을 위해 딕셔너리로 변환합니다."""
+        return {key: getattr(self, key) for key in TESTITEM_COLUMNS}
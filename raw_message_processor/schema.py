@@ -40,13 +40,20 @@ master_default_dict = {
     field["name"]: None for field in json.loads(master_schema.schema_str)["fields"]
 }
 full_schema = get_schema_from_registry(10)
+final_schema = (
+    get_schema_from_registry(settings.schema_registry.final_schema_id)
+    if settings.producer.final_topic
+    else None
+)
 
 
 # Avro 직렬화기 생성
 master_serializer = get_avro_serializer(master_schema)
 full_serializer = get_avro_serializer(full_schema)
+final_serializer = get_avro_serializer(final_schema) if final_schema else None
 master_deserializer = None
 full_deserializer = None
+final_deserializer = None
 
 if __debug__:
     from confluent_kafka.schema_registry.avro import AvroDeserializer
@@ -59,3 +66,8 @@ if __debug__:
         schema_registry_client,
         full_schema.schema_str,
     )
+    if final_schema:
+        final_deserializer = AvroDeserializer(
+            schema_registry_client,
+            final_schema.schema_str,
+        )
@@ -0,0 +1,16 @@
+import json
+import sys
+import types
+from pathlib import Path
+
+# schema 모듈은 import 시점에 스키마 레지스트리에 접속하므로, 테스트에서는 로컬 스키마 파일로 대체합니다.
+_master_schema = json.loads(
+    (Path(__file__).parent.parent / "schema" / "master_message.json").read_text(
+        encoding="utf-8"
+    )
+)
+_schema_module = types.ModuleType("raw_message_processor.schema")
+_schema_module.master_default_dict = {
+    field["name"]: None for field in _master_schema["fields"]
+}
+sys.modules["raw_message_processor.schema"] = _schema_module
@@ -0,0 +1,103 @@
+import pytest
+
+from raw_message_processor.exceptions import DelimiterNotFoundError
+from raw_message_processor.parser import get_parser_for
+
+
+def build_message(booting: str = "", body: str = "", tail: str = "") -> bytes:
+    """부팅, 헤더, 바디, 테일로 구성된 검사기 로그를 생성합니다."""
+    lines = [
+        booting,
+        "#INIT",
+        "TESTCODE : TOP42",
+        "MODEL : SM-X100",
+        "#TEST",
+        body,
+        "NR_n78_TX_636666CH_S876 R23 A54 P8_Ant54 Power, 19.8, 18.5, 21.5, PASS",
+        "#END",
+        "RESULT : PASS",
+        "TIME : 12:34:56",
+        tail,
+    ]
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def test_parse_master_and_detail():
+    parser = get_parser_for("TOP42")
+    parsed_message = parser.parse(
+        build_message(
+            booting="BOOT_ITEM, 1, 0, 2, PASS",
+            body="LTE_B1_RX_300CH_S1_Sens, 1, 0, 2, FAIL\r\nLTE_B1_RX_300CH_S1_Sens, 1.5, 0, 2, PASS",
+        )
+    )
+
+    master = parsed_message["MASTER"]
+    assert master["TESTCODE"] == "TOP42"
+    assert master["MODEL"] == "SM-X100"
+    assert master["RESULT"] == "PASS"
+    assert master["TIME"] == "12:34:56"
+
+    detail = parsed_message["DETAIL"]
+    assert [
+        (r["Test_Conditions"], r["Measured_Value"], r["INSP_DTL_SEQ"], r["IS_FINAL"])
+        for r in detail
+    ] == [
+        ("BOOT_ITEM", "1", "0", "Y"),
+        ("LTE_B1_RX_300CH_S1_Sens", "1", "1", "N"),
+        ("LTE_B1_RX_300CH_S1_Sens", "1.5", "2", "Y"),
+        ("NR_n78_TX_636666CH_S876 R23 A54 P8_Ant54 Power", "19.8", "3", "Y"),
+    ]
+    assert detail[0]["RF_INFO"] is None
+    assert detail[3]["RF_INFO"] == {
+        "tech": "NR",
+        "band": "n78",
+        "direction": "TX",
+        "channel": "636666CH",
+        "sigpath": "S876 R23 A54 P8",
+        "item": "Ant54 Power",
+    }
+
+
+def test_parse_detail_returns_final_records():
+    parser = get_parser_for("TOP42")
+    sections = parser.split(
+        build_message(body="A_ITEM, 1, 0, 2, FAIL\r\nA_ITEM, 1.5, 0, 2, PASS")
+    )
+    detail, final = parser.parse_detail(sections)
+
+    assert len(detail) == 3
+    assert [(r["Test_Conditions"], r["Measured_Value"]) for r in final] == [
+        ("A_ITEM", "1.5"),
+        ("NR_n78_TX_636666CH_S876 R23 A54 P8_Ant54 Power", "19.8"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "booting, body, tail",
+    [
+        ("// #INIT boot marker", "", ""),
+        ("/* #TEST in booting */", "", ""),
+        ("", "/* #END of block */", ""),
+        ("", "// #END inline", ""),
+        ("", "<< #END title >>", ""),
+        ("", "===== #END =====", ""),
+        ("", "", "// #INIT after tail"),
+    ],
+)
+def test_delimiters_inside_comments_are_ignored(booting, body, tail):
+    parser = get_parser_for("TOP42")
+    parsed_message = parser.parse(build_message(booting, body, tail))
+
+    assert [r["Test_Conditions"] for r in parsed_message["DETAIL"]] == [
+        "NR_n78_TX_636666CH_S876 R23 A54 P8_Ant54 Power"
+    ]
+    assert parsed_message["MASTER"]["TESTCODE"] == "TOP42"
+    assert parsed_message["MASTER"]["RESULT"] == "PASS"
+
+
+def test_delimiter_only_inside_comment_is_not_found():
+    parser = get_parser_for("TOP42")
+    message = b"#INIT\r\nTESTCODE : TOP42\r\n#TEST\r\n/* #END */\r\n"
+
+    with pytest.raises(DelimiterNotFoundError):
+        parser.split(message)